@@ -1,6 +1,24 @@
-from .frontend import StdioFrontend
-from .tcpdialler import TcpDialler
+import argparse
 
+from .dialler import TcpDialler
+from .frontend import StdioFrontend, TcpFrontend
 
-frontend = StdioFrontend(TcpDialler)
-frontend.run()
\ No newline at end of file
+
+parser = argparse.ArgumentParser(
+    prog='python -m tcpatmodem',
+    description='AT command interpreter and TCP dialler')
+parser.add_argument('--listen', metavar='[HOST:]PORT',
+                    help='serve virtual modems to DTEs connecting on this '
+                    'TCP port instead of using standard in and out')
+parser.add_argument('--max-sessions', type=int, default=100,
+                    help='maximum number of concurrent virtual modems '
+                    '(default: %(default)s)')
+args = parser.parse_args()
+
+if args.listen:
+    host, _, port = args.listen.rpartition(':')
+    frontend = TcpFrontend(TcpDialler, host or None, int(port),
+                           args.max_sessions)
+else:
+    frontend = StdioFrontend(TcpDialler)
+frontend.run()
@@ -1,6 +1,7 @@
 import re
 
 from enum import Enum
+from io import TextIOBase
 from time import time
 
 ATState = Enum('ATState', 'IDLE A T CMD CONNECTING CONNECTED PLUS PLUSWAIT')
@@ -29,6 +30,9 @@ ATResultCode = {
     'CONNECT 38400': 28,
 }
 
+CR = ord('\r')
+BS = ord('\b')
+
 starts_with_number_re = re.compile('^(\\d*)(.*)$')
 
 
@@ -50,23 +54,33 @@ class DiallerCaller:
     def dialler_disconnected(self, msg=''):
         pass
 
-    def dialler_received(self, c):
+    def dialler_received(self, data):
+        pass
+
+    def dialler_pause_writing(self):
+        pass
+
+    def dialler_resume_writing(self):
         pass
 
 
 class ATFSM(DiallerCaller):
-    def __init__(self, dte_file):
+    def __init__(self, dte_file, recv_buffer_size=16384):
         self.dialler = None
+        self.frontend = None
         self.state = ATState.A
         self.dte_recv_ts = time()
-        self.esc_char = '+'
+        self.esc_char = ord('+')
         self.esc_timeout = 1.0
-        self.cr_char = '\r'
-        self.lf_char = '\n'
-        self.bs_char = '\b'
+        self.cr_char = ord('\r')
+        self.lf_char = ord('\n')
+        self.bs_char = ord('\b')
         self.cmd = ''
-        self.plusbuffer = ''
-        self.recvbuffer = ''
+        self.plus_count = 0
+        self.recvbuffer = bytearray()
+        self.recv_buffer_size = recv_buffer_size
+        self.dce_paused_by = set()
+        self.dte_paused = False
         self.is_connected = False
         self.echo = True
         self.output = True
@@ -75,6 +89,7 @@ class ATFSM(DiallerCaller):
         self.x = 0
         self.register = 0
         self.dte_file = dte_file
+        self.dte_text = isinstance(dte_file, TextIOBase)
         self.commands = {
             'a': self.command_error,
             'd': self.command_d,
@@ -94,100 +109,143 @@ class ATFSM(DiallerCaller):
             '=': self.command_equals,
         }
 
+    @property
+    def plusbuffer(self):
+        """The escape characters received so far, as a string"""
+        return chr(self.esc_char) * self.plus_count
+
     def check_escape(self):
-        if self.state == ATState.PLUSWAIT and len(self.plusbuffer) == 3 \
+        if self.state == ATState.PLUSWAIT and self.plus_count == 3 \
                 and time() - self.dte_recv_ts > self.esc_timeout:
-            self.dte_echo('\r\nOK\r\n')
+            self.dte_echo(b'\r\nOK\r\n')
             self.state = ATState.A
 
-    def dce_output(self, c):
+    def dce_output(self, data):
         if self.dialler:
-            self.dialler.write(c)
-
-    def dte_input(self, c):  # noqa: C901
+            self.dialler.write(data)
+
+    def dce_output_plus(self, c):
+        """Pass on an aborted escape sequence plus the byte that aborted it"""
+        self.dce_output(bytes((self.esc_char,)) * self.plus_count
+                        + bytes((c,)))
+
+    def dte_input_bytes(self, buf):
+        """Process a chunk of bytes read from the DTE.
+
+        All bytes in one chunk are considered to have arrived at the same
+        time. In data mode, an escape sequence can therefore only begin with
+        the first byte of a chunk, and only if the guard time has elapsed
+        since the previous chunk; everything else is passed on to the DCE
+        with a single write.
+        """
+        now = time()
+        i = 0
+        while i < len(buf):
+            if self.state == ATState.CONNECTED and not (
+                    buf[i] == self.esc_char
+                    and now - self.dte_recv_ts > self.esc_timeout):
+                self.dce_output(buf[i:] if i else buf)
+                self.dte_recv_ts = now
+                return
+            self.dte_input_byte(buf[i], now)
+            i += 1
+
+    def dte_input(self, c, now=None):
+        """Process one or more characters from the DTE, one at a time.
+
+        Strings are accepted for compatibility and converted to bytes.
+        """
+        if now is None:
+            now = time()
+        if isinstance(c, str):
+            c = c.encode('latin-1')
+        for b in c:
+            self.dte_input_byte(b, now)
+
+    def dte_input_byte(self, c, now):  # noqa: C901
         if self.state == ATState.IDLE:
-            if c == '\r':
+            if c == CR:
                 self.state = ATState.A
-            self.dte_echo(c)
+            self.dte_echo(bytes((c,)))
         elif self.state == ATState.A:
-            if c == 'a' or c == 'A':
+            if c == ord('a') or c == ord('A'):
                 self.state = ATState.T
-            elif c == '\r':
+            elif c == CR:
                 self.state = ATState.A
             else:
                 self.state = ATState.IDLE
-            self.dte_echo(c)
+            self.dte_echo(bytes((c,)))
         elif self.state == ATState.T:
-            if c == '/':
-                self.dte_echo(c)
-                self.dte_echo('\r\n')
+            if c == ord('/'):
+                self.dte_echo(b'/\r\n')
                 self.state = ATState.A
                 self.dte_command(self.cmd)
             else:
-                if c == 't' or c == 'T':
+                if c == ord('t') or c == ord('T'):
                     self.state = ATState.CMD
                     self.cmd = ''
-                elif c == '\r':
+                elif c == CR:
                     self.state = ATState.A
                 else:
                     self.state = ATState.IDLE
-                self.dte_echo(c)
+                self.dte_echo(bytes((c,)))
         elif self.state == ATState.CMD:
-            if c == '\r':
-                self.dte_echo('\r\n')
+            if c == CR:
+                self.dte_echo(b'\r\n')
                 self.state = ATState.A
                 self.dte_command(self.cmd)
-            elif c == '\b':
+            elif c == BS:
                 if len(self.cmd) > 0:
-                    self.dte_echo('\b \b')
+                    self.dte_echo(b'\b \b')
                     self.cmd = self.cmd[:-1]
             else:
-                self.cmd += c
-                self.dte_echo(c)
+                self.cmd += chr(c)
+                self.dte_echo(bytes((c,)))
         elif self.state == ATState.CONNECTING:
             if self.dialler:
                 self.dialler.hangup()
             self.disconnected()
         elif self.state == ATState.CONNECTED:
             if c == self.esc_char \
-                    and time() - self.dte_recv_ts > self.esc_timeout:
+                    and now - self.dte_recv_ts > self.esc_timeout:
                 self.state = ATState.PLUS
-                self.plusbuffer = c
+                self.plus_count = 1
             else:
-                self.dce_output(c)
+                self.dce_output(bytes((c,)))
         elif self.state == ATState.PLUS:
             if c == self.esc_char:
-                self.plusbuffer += c
-                if len(self.plusbuffer) == 3:
+                self.plus_count += 1
+                if self.plus_count == 3:
                     self.state = ATState.PLUSWAIT
             else:
                 self.state = ATState.CONNECTED
-                self.dce_output(self.plusbuffer + c)
+                self.dce_output_plus(c)
         elif self.state == ATState.PLUSWAIT:
             self.state = ATState.CONNECTED
-            self.dce_output(self.plusbuffer + c)
+            self.dce_output_plus(c)
         else:
             raise Exception('Invalid internal state')
-        self.dte_recv_ts = time()
+        self.dte_recv_ts = now
 
-    def dte_output(self, c):
-        self.dte_file.write(c)
-        self.dte_file.flush()
+    def dte_output(self, data):
+        if self.dte_text:
+            data = bytes(data).decode('latin-1')
+        self.dte_file.write(data)
 
-    def dte_echo(self, c):
+    def dte_echo(self, data):
         if self.echo:
-            self.dte_output(c)
+            self.dte_output(data)
 
     def dte_response(self, s):
         if self.output:
             if self.verbose:
-                self.dte_output(s + '\r\n')
+                self.dte_output((s + '\r\n').encode('latin-1'))
             else:
                 best = 'OK'
                 for k in ATResultCode.keys():
                     if s[0:len(k)] == k and len(k) > len(best):
                         best = k
-                self.dte_output(f'{ATResultCode[best]}\r\n')
+                self.dte_output(f'{ATResultCode[best]}\r\n'.encode())
 
     def dte_command(self, cmd):
         ok = True
@@ -214,18 +272,58 @@ class ATFSM(DiallerCaller):
             self.dte_response('CONNECT')
         self.is_connected = True
         self.state = ATState.CONNECTED
+        if self.dce_paused_by and self.dialler:
+            self.dialler.pause_reading()
 
     def dialler_disconnected(self):
         self.dte_response('NO CARRIER')
         self.is_connected = False
         self.state = ATState.A
+        self.recvbuffer = bytearray()
+        self.dce_paused_by.discard('recvbuffer')
+        self.dialler_resume_writing()
 
-    def dialler_received(self, c):
+    def dialler_received(self, data):
         if self.is_connected:
             if self.state == ATState.CONNECTED:
-                self.dte_output(c)
+                self.dte_output(data)
             else:
-                self.recvbuffer += c
+                space = self.recv_buffer_size - len(self.recvbuffer)
+                self.recvbuffer += data[:space]
+                if len(self.recvbuffer) >= self.recv_buffer_size:
+                    self.pause_dce('recvbuffer')
+
+    def dialler_pause_writing(self):
+        if not self.dte_paused:
+            self.dte_paused = True
+            if self.frontend:
+                self.frontend.pause_reading()
+
+    def dialler_resume_writing(self):
+        if self.dte_paused:
+            self.dte_paused = False
+            if self.frontend:
+                self.frontend.resume_reading()
+
+    def dte_pause_writing(self):
+        """Called by the DTE writer when its buffer is filling up"""
+        self.pause_dce('dte')
+
+    def dte_resume_writing(self):
+        """Called by the DTE writer when its buffer has drained"""
+        self.resume_dce('dte')
+
+    def pause_dce(self, reason):
+        if not self.dce_paused_by:
+            if self.dialler:
+                self.dialler.pause_reading()
+        self.dce_paused_by.add(reason)
+
+    def resume_dce(self, reason):
+        if reason in self.dce_paused_by:
+            self.dce_paused_by.remove(reason)
+            if not self.dce_paused_by and self.dialler:
+                self.dialler.resume_reading()
 
     def command_error(self, cmd):
         return (False, 'ERROR', '')
@@ -261,11 +359,17 @@ class ATFSM(DiallerCaller):
             return (False, 'ERROR', '')
         return (True, i, cmd)
 
+    def command_number(self, cmd):
+        (n, cmd) = parse_number(cmd)
+        return (True, 'OK', cmd)
+
     def command_o(self, cmd):
         if self.is_connected:
             self.state = ATState.CONNECTED
-            self.dte_output(self.recvbuffer)
-            self.recvbuffer == ''
+            if self.recvbuffer:
+                self.dte_output(self.recvbuffer)
+                self.recvbuffer = bytearray()
+            self.resume_dce('recvbuffer')
             return (None, '', '')
         else:
             return (True, 'NO CARRIER', '')
@@ -303,13 +407,13 @@ class ATFSM(DiallerCaller):
 
     def command_questionmark(self, cmd):
         if self.register == 2:
-            v = ord(self.esc_char)
+            v = self.esc_char
         elif self.register == 3:
-            v = ord(self.cr_char)
+            v = self.cr_char
         elif self.register == 4:
-            v = ord(self.lf_char)
+            v = self.lf_char
         elif self.register == 5:
-            v = ord(self.bs_char)
+            v = self.bs_char
         elif self.register == 12:
             v = int(self.esc_timeout * 100)
         else:
@@ -321,13 +425,13 @@ class ATFSM(DiallerCaller):
         if n is None:
             return (False, 'ERROR', '')
         if self.register == 2:
-            self.esc_char = chr(n)
+            self.esc_char = n
         elif self.register == 3:
-            self.cr_char = chr(n)
+            self.cr_char = n
         elif self.register == 4:
-            self.lf_char = chr(n)
+            self.lf_char = n
         elif self.register == 5:
-            self.bs_char = chr(n)
+            self.bs_char = n
         elif self.register == 12:
             self.esc_timeout = n * .01
         elif self.register == 99:
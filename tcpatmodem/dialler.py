@@ -9,11 +9,18 @@ class Dialler:
         self.loop = loop
         self.atfsm = atfsm
         self.protocol = None
+        self.write_buffer_high = None
 
     def hangup(self):
         pass
 
-    def write(self):
+    def write(self, data):
+        pass
+
+    def pause_reading(self):
+        pass
+
+    def resume_reading(self):
         pass
 
 
@@ -25,11 +32,18 @@ class TcpDiallerProtocol(asyncio.Protocol):
 
     def connection_made(self, transport: asyncio.transports.BaseTransport):
         self.transport = transport
+        if self.dialler.write_buffer_high is not None:
+            transport.set_write_buffer_limits(self.dialler.write_buffer_high)
         self.atfsm.dialler_connected('')
 
     def data_received(self, data: bytes):
-        for c in data:
-            self.atfsm.dialler_received(chr(c))
+        self.atfsm.dialler_received(data)
+
+    def pause_writing(self):
+        self.atfsm.dialler_pause_writing()
+
+    def resume_writing(self):
+        self.atfsm.dialler_resume_writing()
 
     def connection_lost(self, exc: Optional[Exception]):
         self.atfsm.dialler_disconnected()
@@ -48,6 +62,14 @@ class TcpDialler(Dialler):
         if self.protocol and self.protocol.transport:
             self.protocol.transport.abort()
 
-    def write(self, s):
+    def write(self, data):
+        if self.protocol and self.protocol.transport:
+            self.protocol.transport.write(data)
+
+    def pause_reading(self):
+        if self.protocol and self.protocol.transport:
+            self.protocol.transport.pause_reading()
+
+    def resume_reading(self):
         if self.protocol and self.protocol.transport:
-            self.protocol.transport.write(s.encode())
+            self.protocol.transport.resume_reading()
@@ -2,22 +2,49 @@ import asyncio
 import sys
 
 from .atfsm import ATFSM
-from.rawtty import setraw
+from .rawtty import setraw
+from .writer import CoalescingWriter
 
 
-class StdioFrontend:
-    def __init__(self, dialler_class):
-        self.fsm = ATFSM(sys.stdout)
+class Frontend:
+    """Callbacks into the frontend from the AT FSM"""
+
+    def pause_reading(self):
+        pass
+
+    def resume_reading(self):
+        pass
+
+
+class StdioFrontend(Frontend):
+    def __init__(self, dialler_class, max_latency=0, max_size=4096):
         self.dialler_class = dialler_class
+        self.max_latency = max_latency
+        self.max_size = max_size
 
     def run(self):
-        fd = sys.stdin.fileno()
+        fd = self.fd = sys.stdin.fileno()
         setraw(fd)
         self.loop = asyncio.get_event_loop()
+        self.writer = CoalescingWriter(self.loop, sys.stdout.buffer,
+                                       self.max_latency, self.max_size)
+        self.fsm = ATFSM(self.writer)
+        self.fsm.frontend = self
         self.fsm.dialler = self.dialler_class(self.loop, self.fsm)
+        self.writer.on_pause = self.fsm.dte_pause_writing
+        self.writer.on_resume = self.fsm.dte_resume_writing
         self.loop.add_reader(fd, self.reader)
         self.loop.call_later(0.1, self.repeat)
-        self.loop.run_forever()
+        try:
+            self.loop.run_forever()
+        finally:
+            self.writer.flush()
+
+    def pause_reading(self):
+        self.loop.remove_reader(self.fd)
+
+    def resume_reading(self):
+        self.loop.add_reader(self.fd, self.reader)
 
     def repeat(self):
         self.fsm.check_escape()
@@ -27,5 +54,93 @@ class StdioFrontend:
 
     def reader(self):
         b = sys.stdin.buffer.raw.read(1024)
-        for c in b:
-            self.fsm.dte_input(chr(c))
+        self.fsm.dte_input_bytes(b)
+
+
+class TcpSession(asyncio.Protocol, Frontend):
+    """A virtual modem for one DTE connected through TCP"""
+
+    def __init__(self, bank):
+        self.bank = bank
+        self.transport = None
+        self.fsm = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+        if len(self.bank.sessions) >= self.bank.max_sessions:
+            transport.write(b'BUSY\r\n')
+            transport.close()
+            return
+        loop = self.bank.loop
+        self.writer = CoalescingWriter(loop, self, self.bank.max_latency,
+                                       self.bank.max_size)
+        self.fsm = ATFSM(self.writer)
+        self.fsm.frontend = self
+        self.fsm.dialler = self.bank.dialler_class(loop, self.fsm)
+        self.bank.sessions.add(self)
+
+    def data_received(self, data):
+        if self.fsm:
+            self.fsm.dte_input_bytes(data)
+
+    def connection_lost(self, exc):
+        if self.fsm:
+            self.bank.sessions.discard(self)
+            self.writer.flush()
+            self.fsm.dialler.hangup()
+            self.fsm = None
+
+    def pause_writing(self):
+        self.fsm.dte_pause_writing()
+
+    def resume_writing(self):
+        self.fsm.dte_resume_writing()
+
+    def pause_reading(self):
+        self.transport.pause_reading()
+
+    def resume_reading(self):
+        self.transport.resume_reading()
+
+    def write(self, data):
+        self.transport.write(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.writer.flush()
+        self.transport.close()
+
+
+class TcpFrontend:
+    """Serve a bank of virtual modems to DTEs connecting through TCP"""
+
+    def __init__(self, dialler_class, host=None, port=2323, max_sessions=100,
+                 max_latency=0, max_size=4096):
+        self.dialler_class = dialler_class
+        self.host = host
+        self.port = port
+        self.max_sessions = max_sessions
+        self.max_latency = max_latency
+        self.max_size = max_size
+        self.sessions = set()
+        self.server = None
+
+    async def start(self):
+        self.loop = asyncio.get_running_loop()
+        self.server = await self.loop.create_server(
+            lambda: TcpSession(self), self.host, self.port)
+        self.loop.call_later(0.1, self.repeat)
+
+    def run(self):
+        self.loop = asyncio.get_event_loop()
+        self.loop.run_until_complete(self.start())
+        self.loop.run_forever()
+
+    def repeat(self):
+        for session in list(self.sessions):
+            session.fsm.check_escape()
+            if session.fsm.quit:
+                session.close()
+        self.loop.call_later(0.1, self.repeat)
@@ -7,8 +7,10 @@ from os import isatty
 
 old_settings = {}
 
-def setraw(fd=sys.stdin.fileno()):
-    global old_settings
+
+def setraw(fd=None):
+    if fd is None:
+        fd = sys.stdin.fileno()
     if not isatty(fd):
         return
     if fd in old_settings:
@@ -17,7 +19,10 @@ def setraw(fd=sys.stdin.fileno()):
     tty.setraw(fd)
     atexit.register(restore, fd)
 
-def restore(fd=sys.stdin.fileno()):
+
+def restore(fd=None):
+    if fd is None:
+        fd = sys.stdin.fileno()
     if fd not in old_settings:
         return
     termios.tcsetattr(fd, termios.TCSADRAIN, old_settings[fd])
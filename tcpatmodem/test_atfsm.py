@@ -1,6 +1,6 @@
-from io import StringIO
+from io import BytesIO, StringIO
 from unittest import TestCase
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 from .atfsm import ATFSM, ATState
 
@@ -102,6 +102,92 @@ class ATFSMTest(TestCase):
         self.dut.check_escape()
         self.assertEqual(self.dut.state, ATState.A)
 
+    @patch('tcpatmodem.atfsm.time')
+    def test_dte_input_bytes_connected(self, time):
+        dialler = Mock()
+        self.dut.dialler = dialler
+        self.dut.state = ATState.CONNECTED
+        time.return_value = 0.1
+        self.dut.dte_input_bytes(b'abc+++def')
+        dialler.write.assert_called_once_with(b'abc+++def')
+        self.assertEqual(self.dut.state, ATState.CONNECTED)
+        self.assertEqual(self.dut.dte_recv_ts, 0.1)
+
+    @patch('tcpatmodem.atfsm.time')
+    def test_dte_input_bytes_escape(self, time):
+        dialler = Mock()
+        self.dut.dialler = dialler
+        self.dut.state = ATState.CONNECTED
+        time.return_value = 0.1
+        self.dut.dte_input_bytes(b'+')
+        self.assertEqual(self.dut.state, ATState.CONNECTED)
+
+        time.return_value += self.dut.esc_timeout + 0.01
+        self.dut.dte_input_bytes(b'++')
+        self.assertEqual(self.dut.state, ATState.PLUS)
+        self.dut.dte_input_bytes(b'+')
+        self.assertEqual(self.dut.state, ATState.PLUSWAIT)
+        self.dut.dte_input_bytes(b'xyz')
+        self.assertEqual(self.dut.state, ATState.CONNECTED)
+        self.assertEqual([c.args[0] for c in dialler.write.call_args_list],
+                         [b'+', b'+++x', b'yz'])
+
+    def test_dte_input_bytes_command(self):
+        self.dut.dte_input_bytes(b'ATE1\r')
+        self.assertEqual(self.dut.state, ATState.A)
+        self.assertEqual(self.dte.getvalue(), 'ATE1\r\nOK\r\n')
+
+    def test_dialler_received_binary(self):
+        self.dte = BytesIO()
+        self.dut = ATFSM(self.dte)
+        self.dut.dialler_connected()
+        self.dut.dialler_received(bytes(range(256)))
+        self.assertEqual(self.dte.getvalue(),
+                         b'CONNECT\r\n' + bytes(range(256)))
+
+    def test_dialler_received_command_mode(self):
+        self.dut.dialler_connected()
+        self.dut.state = ATState.A
+        self.dut.dialler_received(b'\xff\x00')
+        self.assertEqual(self.dut.recvbuffer, b'\xff\x00')
+        self.dut.dte_command('o')
+        self.assertEqual(self.dut.state, ATState.CONNECTED)
+        self.assertEqual(self.dut.recvbuffer, b'')
+        self.assertTrue(self.dte.getvalue().endswith('\xff\x00'))
+
+    def test_dialler_received_bounded(self):
+        self.dut = ATFSM(self.dte, recv_buffer_size=4)
+        self.dut.dialler = Mock()
+        self.dut.dialler_connected()
+        self.dut.state = ATState.A
+        self.dut.dialler_received(b'abc')
+        self.dut.dialler.pause_reading.assert_not_called()
+        self.dut.dialler_received(b'def')
+        self.assertEqual(self.dut.recvbuffer, b'abcd')
+        self.dut.dialler.pause_reading.assert_called_once()
+        self.dut.dte_command('o')
+        self.dut.dialler.resume_reading.assert_called_once()
+
+    def test_dte_pause_writing(self):
+        self.dut.dialler = Mock()
+        self.dut.dte_pause_writing()
+        self.dut.dialler.pause_reading.assert_called_once()
+        self.dut.dialler_connected()
+        self.dut.state = ATState.A
+        self.dut.dialler_received(b'x' * self.dut.recv_buffer_size)
+        self.dut.dte_resume_writing()
+        self.dut.dialler.resume_reading.assert_not_called()
+        self.dut.dte_command('o')
+        self.dut.dialler.resume_reading.assert_called_once()
+
+    def test_dialler_pause_writing(self):
+        self.dut.frontend = Mock()
+        self.dut.dialler_pause_writing()
+        self.dut.dialler_pause_writing()
+        self.dut.frontend.pause_reading.assert_called_once()
+        self.dut.dialler_resume_writing()
+        self.dut.frontend.resume_reading.assert_called_once()
+
     def test_dte_command_invalid(self):
         r = self.dut.dte_command('-')
         self.assertFalse(r)
@@ -0,0 +1,57 @@
+import asyncio
+
+from unittest import IsolatedAsyncioTestCase
+
+from .dialler import Dialler
+from .frontend import TcpFrontend
+
+
+class TcpFrontendTest(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.dut = TcpFrontend(Dialler, '127.0.0.1', 0, max_sessions=2)
+        await self.dut.start()
+        self.port = self.dut.server.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        self.dut.server.close()
+        await self.dut.server.wait_closed()
+
+    async def connect(self):
+        return await asyncio.open_connection('127.0.0.1', self.port)
+
+    async def test_session(self):
+        reader, writer = await self.connect()
+        writer.write(b'ATI1\r')
+        self.assertEqual(await reader.readuntil(b'OK\r\n'),
+                         b'ATI1\r\nv0.1\r\n')
+        self.assertEqual(len(self.dut.sessions), 1)
+        writer.close()
+        await writer.wait_closed()
+        await asyncio.sleep(0.01)
+        self.assertEqual(len(self.dut.sessions), 0)
+
+    async def test_isolation(self):
+        r1, w1 = await self.connect()
+        r2, w2 = await self.connect()
+        w1.write(b'ATE0\r')
+        await r1.readuntil(b'OK\r\n')
+        w2.write(b'ATI1\r')
+        self.assertEqual(await r2.readuntil(b'\r\n'), b'ATI1\r\n')
+        w1.write(b'ATI1\r')
+        self.assertEqual(await r1.readuntil(b'\r\n'), b'v0.1\r\n')
+        w1.close()
+        w2.close()
+
+    async def test_max_sessions(self):
+        connections = [await self.connect() for _ in range(3)]
+        reader, writer = connections[2]
+        self.assertEqual(await reader.read(), b'BUSY\r\n')
+        self.assertEqual(len(self.dut.sessions), 2)
+        for _, writer in connections:
+            writer.close()
+
+    async def test_quit(self):
+        reader, writer = await self.connect()
+        writer.write(b'ATS99=99\r')
+        self.assertEqual(await reader.read(), b'ATS99=99\r\nOK\r\n')
+        writer.close()
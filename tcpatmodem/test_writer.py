@@ -0,0 +1,58 @@
+import asyncio
+
+from io import BytesIO
+from unittest import TestCase
+from unittest.mock import Mock
+
+from .writer import CoalescingWriter
+
+
+class CoalescingWriterTest(TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.file = Mock(wraps=BytesIO())
+        self.dut = CoalescingWriter(self.loop, self.file, max_size=8)
+
+    def tearDown(self):
+        self.loop.close()
+
+    def run_once(self):
+        self.loop.run_until_complete(asyncio.sleep(0))
+
+    def test_coalesce(self):
+        self.dut.write(b'a')
+        self.dut.write(b'bc')
+        self.file.write.assert_not_called()
+        self.run_once()
+        self.file.write.assert_called_once()
+        self.file.flush.assert_called_once()
+        self.assertEqual(self.file.getvalue(), b'abc')
+
+    def test_max_size(self):
+        self.dut.write(b'0123')
+        self.dut.write(b'4567')
+        self.file.write.assert_called_once()
+        self.assertEqual(self.file.getvalue(), b'01234567')
+        self.run_once()
+        self.file.write.assert_called_once()
+
+    def test_max_latency(self):
+        self.dut.max_latency = 0.01
+        self.dut.write(b'a')
+        self.run_once()
+        self.file.write.assert_not_called()
+        self.loop.run_until_complete(asyncio.sleep(0.02))
+        self.assertEqual(self.file.getvalue(), b'a')
+
+    def test_water_marks(self):
+        self.dut = CoalescingWriter(self.loop, self.file, max_size=100,
+                                    high_water=8, low_water=4)
+        self.dut.on_pause = Mock()
+        self.dut.on_resume = Mock()
+        self.dut.write(b'01234567')
+        self.dut.on_pause.assert_not_called()
+        self.dut.write(b'8')
+        self.dut.on_pause.assert_called_once()
+        self.dut.on_resume.assert_not_called()
+        self.run_once()
+        self.dut.on_resume.assert_called_once()
@@ -0,0 +1,57 @@
+class CoalescingWriter:
+    """Buffer output to a file and write it out in as few calls as possible.
+
+    Everything written within one iteration of the event loop is collected
+    and written and flushed to the file at once, at the latest `max_latency`
+    seconds after the first write (zero means at the end of the current
+    iteration). Once `max_size` bytes have accumulated, they are written
+    immediately.
+
+    When more than `high_water` bytes are buffered, `on_pause` is called;
+    once the buffer has drained below `low_water`, `on_resume` is called.
+    """
+
+    def __init__(self, loop, file, max_latency=0, max_size=4096,
+                 high_water=65536, low_water=16384):
+        self.loop = loop
+        self.file = file
+        self.max_latency = max_latency
+        self.max_size = max_size
+        self.high_water = high_water
+        self.low_water = low_water
+        self.on_pause = None
+        self.on_resume = None
+        self.paused = False
+        self.buffer = bytearray()
+        self.handle = None
+
+    def write(self, data):
+        self.buffer += data
+        if not self.paused and len(self.buffer) > self.high_water:
+            self.paused = True
+            if self.on_pause:
+                self.on_pause()
+        if len(self.buffer) >= self.max_size:
+            self.flush()
+        elif self.handle is None:
+            if self.max_latency > 0:
+                self.handle = self.loop.call_later(self.max_latency,
+                                                   self.flush)
+            else:
+                self.handle = self.loop.call_soon(self.flush)
+
+    def flush(self):
+        if self.handle:
+            self.handle.cancel()
+            self.handle = None
+        if self.buffer:
+            data, self.buffer = self.buffer, bytearray()
+            self.file.write(data)
+            self.file.flush()
+        self.check_resume()
+
+    def check_resume(self):
+        if self.paused and len(self.buffer) < self.low_water:
+            self.paused = False
+            if self.on_resume:
+                self.on_resume()